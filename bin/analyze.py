@@ -29,22 +29,20 @@ def main():
         config = Config(str(Path("config/config.yaml")))
         
         # Initialize analyzer
-        analyzer = Analysis(config.get_db_url())
+        analyzer = Analysis(config.get_db_url(), **config.analysis_config)
         
         # Run all analyses
-        dept_metrics = analyzer.department_metrics()
-        level_metrics = analyzer.level_metrics()
-        salary_ranges = analyzer.salary_ranges()
+        metrics = analyzer.all_metrics()
         
         # Print results
         print("\nDepartment Metrics:")
-        print(dept_metrics)
+        print(metrics['department_metrics'])
         
         print("\nLevel Metrics:")
-        print(level_metrics)
+        print(metrics['level_metrics'])
         
         print("\nSalary Ranges:")
-        print(salary_ranges)
+        print(metrics['salary_ranges'])
         
         logger.info("Analysis completed successfully")
         
@@ -2,10 +2,12 @@
 Script to analyze employee data with transformations.
 """
 import logging
-import pandas as pd
+import polars as pl
 from pathlib import Path
+from typing import List
 from src.config_handler import Config
 from src.employee_queries import EmployeeQueries
+from src.analysis import SALARY_BINS, SALARY_LABELS
 
 def setup_logging():
     """Set up logging configuration."""
@@ -14,75 +16,80 @@ def setup_logging():
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
 
-def analyze_department_metrics(queries: EmployeeQueries):
+def load_employees(queries: EmployeeQueries, columns: List[str]) -> pl.LazyFrame:
+    """Load the given employee columns as a Polars LazyFrame."""
+    query = f"SELECT {', '.join(columns)} FROM employees"
+    return pl.read_database(query, connection=queries.engine).lazy()
+
+def analyze_department_metrics(queries: EmployeeQueries) -> pl.DataFrame:
     """Analyze metrics by department."""
-    query = """
-    SELECT 
-        department,
-        COUNT(*) as employee_count,
-        AVG(salary) as avg_salary,
-        MIN(salary) as min_salary,
-        MAX(salary) as max_salary,
-        SUM(salary) as total_payroll
-    FROM employees
-    GROUP BY department
-    ORDER BY total_payroll DESC
-    """
-    return pd.read_sql(query, queries.engine)
+    return (
+        load_employees(queries, ['department', 'salary'])
+        .group_by('department')
+        .agg(
+            pl.len().alias('employee_count'),
+            pl.col('salary').mean().alias('avg_salary'),
+            pl.col('salary').min().alias('min_salary'),
+            pl.col('salary').max().alias('max_salary'),
+            pl.col('salary').sum().alias('total_payroll'),
+        )
+        .sort('total_payroll', descending=True)
+        .collect()
+    )
 
-def analyze_level_metrics(queries: EmployeeQueries):
+def analyze_level_metrics(queries: EmployeeQueries) -> pl.DataFrame:
     """Analyze metrics by level."""
-    query = """
-    SELECT 
-        level,
-        COUNT(*) as employee_count,
-        AVG(salary) as avg_salary,
-        MIN(salary) as min_salary,
-        MAX(salary) as max_salary
-    FROM employees
-    GROUP BY level
-    ORDER BY avg_salary DESC
-    """
-    return pd.read_sql(query, queries.engine)
+    return (
+        load_employees(queries, ['level', 'salary'])
+        .group_by('level')
+        .agg(
+            pl.len().alias('employee_count'),
+            pl.col('salary').mean().alias('avg_salary'),
+            pl.col('salary').min().alias('min_salary'),
+            pl.col('salary').max().alias('max_salary'),
+        )
+        .sort('avg_salary', descending=True)
+        .collect()
+    )
 
-def analyze_department_level_distribution(queries: EmployeeQueries):
+def analyze_department_level_distribution(queries: EmployeeQueries) -> pl.DataFrame:
     """Analyze employee distribution by department and level."""
-    query = """
-    SELECT 
-        department,
-        level,
-        COUNT(*) as employee_count,
-        AVG(salary) as avg_salary
-    FROM employees
-    GROUP BY department, level
-    ORDER BY department, avg_salary DESC
-    """
-    return pd.read_sql(query, queries.engine)
+    return (
+        load_employees(queries, ['department', 'level', 'salary'])
+        .group_by('department', 'level')
+        .agg(
+            pl.len().alias('employee_count'),
+            pl.col('salary').mean().alias('avg_salary'),
+        )
+        .sort(['department', 'avg_salary'], descending=[False, True])
+        .collect()
+    )
 
-def analyze_salary_ranges(queries: EmployeeQueries):
+def analyze_salary_ranges(queries: EmployeeQueries) -> pl.DataFrame:
     """Analyze salary ranges and distributions."""
-    query = """
-    SELECT 
-        CASE 
-            WHEN salary >= 120000 THEN 'Very High (120k+)'
-            WHEN salary >= 100000 THEN 'High (100k-120k)'
-            WHEN salary >= 80000 THEN 'Medium (80k-100k)'
-            ELSE 'Entry (Below 80k)'
-        END as salary_range,
-        COUNT(*) as employee_count,
-        AVG(salary) as avg_salary,
-        GROUP_CONCAT(name) as employees
-    FROM employees
-    GROUP BY salary_range
-    ORDER BY avg_salary DESC
-    """
-    return pd.read_sql(query, queries.engine)
+    # Left-closed buckets as a when/then chain; Expr.cut is deprecated in Polars 2
+    salary = pl.col('salary')
+    salary_range = pl.when(salary.is_null()).then(pl.lit(None, dtype=pl.Utf8))
+    for edge, label in zip(SALARY_BINS[1:-1], SALARY_LABELS[:-1]):
+        salary_range = salary_range.when(salary < edge).then(pl.lit(label))
+    salary_range = salary_range.otherwise(pl.lit(SALARY_LABELS[-1])).alias('salary_range')
+    return (
+        load_employees(queries, ['salary'])
+        .group_by(salary_range)
+        .agg(
+            pl.len().alias('employee_count'),
+            pl.col('salary').mean().alias('avg_salary'),
+        )
+        .sort('avg_salary', descending=True)
+        .collect()
+    )
 
 def main():
     """Run various data transformations and analytics."""
     setup_logging()
     logger = logging.getLogger(__name__)
-    pd.set_option('display.float_format', lambda x: '%.2f' % x)
+    pl.Config.set_float_precision(2)
+    pl.Config.set_tbl_rows(-1)
 
     # Initialize queries
     config = Config(str(Path("config/config.yaml")))
@@ -91,19 +98,19 @@ def main():
     # Run analyses
     logger.info("\n1. Department Metrics:")
     dept_metrics = analyze_department_metrics(queries)
-    print(dept_metrics.to_string())
+    print(dept_metrics)
 
     logger.info("\n2. Level Metrics:")
     level_metrics = analyze_level_metrics(queries)
-    print(level_metrics.to_string())
+    print(level_metrics)
 
     logger.info("\n3. Department-Level Distribution:")
     dept_level_dist = analyze_department_level_distribution(queries)
-    print(dept_level_dist.to_string())
+    print(dept_level_dist)
 
     logger.info("\n4. Salary Range Analysis:")
     salary_ranges = analyze_salary_ranges(queries)
-    print(salary_ranges.to_string())
+    print(salary_ranges)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
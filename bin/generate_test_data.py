@@ -4,10 +4,16 @@ Script to generate large test datasets for performance testing.
 """
 import pandas as pd
 import numpy as np
+import sys
 from pathlib import Path
 import time
 import logging
 
+# Add parent directory to Python path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.config_handler import Config
+
 def setup_logging():
     """Set up logging configuration."""
     logging.basicConfig(
@@ -22,7 +28,8 @@ def generate_employee_data(num_records: int) -> pd.DataFrame:
         num_records: Number of records to generate
         
     Returns:
-        DataFrame with synthetic employee data
+        DataFrame with synthetic employee data; numeric columns are int32 and
+        repeated strings are categoricals
     """
     # Lists for random selection
     departments = ['Engineering', 'Sales', 'Marketing', 'HR', 'Finance', 
@@ -32,19 +39,6 @@ def generate_employee_data(num_records: int) -> pd.DataFrame:
               'Seattle', 'Austin', 'Denver', 'Miami', 'Portland', 'Atlanta',
               'Dallas', 'Houston', 'Phoenix', 'Minneapolis', 'Detroit']
     
-    # Generate random data
-    np.random.seed(42)  # For reproducibility
-    
-    data = {
-        'id': range(1, num_records + 1),
-        'name': [f'Employee_{i}' for i in range(num_records)],
-        'age': np.random.randint(22, 65, num_records),
-        'city': np.random.choice(cities, num_records),
-        'department': np.random.choice(departments, num_records),
-        'level': np.random.choice(levels, num_records),
-        'salary': np.random.normal(90000, 20000, num_records).astype(int)
-    }
-    
     # Create occupations based on department
     occupation_map = {
         'Engineering': ['Software Engineer', 'DevOps Engineer', 'System Architect'],
@@ -59,12 +53,43 @@ def generate_employee_data(num_records: int) -> pd.DataFrame:
         'Legal': ['Legal Counsel', 'Compliance Officer', 'Contract Manager']
     }
     
-    data['occupation'] = [
-        np.random.choice(occupation_map[dept])
-        for dept in data['department']
-    ]
+    # Generate random data
+    rng = np.random.default_rng(42)  # For reproducibility
+    
+    # Draw city, department and level codes in one batched call; department
+    # codes are also used to gather occupations per row
+    codes = rng.integers(0, [len(cities), len(departments), len(levels)], size=(num_records, 3))
+    city_codes, dept_codes, level_codes = codes.T
     
-    return pd.DataFrame(data)
+    data = {
+        'id': np.arange(1, num_records + 1),
+        'name': np.char.add('Employee_', np.arange(num_records).astype(str)),
+        'age': rng.integers(22, 65, num_records),
+        'city': np.asarray(cities)[city_codes],
+        'department': np.asarray(departments)[dept_codes],
+        'level': np.asarray(levels)[level_codes],
+        'salary': rng.normal(90000, 20000, num_records).astype(int)
+    }
+    
+    # (departments x 3) lookup table, indexed by department code and a random column;
+    # object dtype so the gather yields references to the existing str objects
+    # rather than fixed-width unicode copies
+    occ_table = np.empty((len(departments), 3), dtype=object)
+    for i, dept in enumerate(departments):
+        occ_table[i] = occupation_map[dept]
+    occ_idx = rng.integers(0, occ_table.shape[1], num_records)
+    data['occupation'] = occ_table[dept_codes, occ_idx]
+    
+    # Narrow numeric columns and dictionary-encode the low-cardinality strings
+    return pd.DataFrame(data).astype({
+        'id': 'int32',
+        'age': 'int32',
+        'salary': 'int32',
+        'city': 'category',
+        'department': 'category',
+        'level': 'category',
+        'occupation': 'category'
+    })
 
 def main():
     """Main function to generate test data."""
@@ -72,9 +97,12 @@ def main():
     logger = logging.getLogger(__name__)
     
     try:
+        # Write to the source file the pipeline reads
+        source_config = Config(str(Path("config/config.yaml"))).source_config
+        output_file = Path(source_config['file_path'])
+        
         # Create output directory if it doesn't exist
-        output_dir = Path('data/source')
-        output_dir.mkdir(parents=True, exist_ok=True)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
         
         # Generate data
         start_time = time.time()
@@ -82,9 +110,12 @@ def main():
         
         df = generate_employee_data(100000)
         
-        # Save to CSV
-        output_file = output_dir / 'employees_large.csv'
-        df.to_csv(output_file, index=False)
+        # Save as Parquet or as a delimited file, depending on the configured path
+        if output_file.suffix == '.parquet':
+            df.to_parquet(output_file, engine='pyarrow', compression='snappy', index=False)
+        else:
+            df.to_csv(output_file, sep=source_config['delimiter'],
+                      header=source_config['header'], index=False)
         
         end_time = time.time()
         duration = end_time - start_time
@@ -39,7 +39,8 @@ def main():
             df=df,
             table_name=target_config['table'],
             db_url=config.get_db_url(),
-            mode=target_config['mode']
+            mode=target_config['mode'],
+            analysis_config=config.analysis_config
         )
         
         logger.info("Data processing completed successfully")
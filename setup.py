@@ -10,7 +10,12 @@ setup(
         "python-dotenv>=1.0.0",
         "PyYAML>=6.0.1",
         "sqlalchemy>=2.0.23",
-        "pandas>=2.1.2"
+        "pandas>=2.1.2",
+        "pyarrow>=14.0.0",
+        "polars>=0.20.5",
+        "numba>=0.59.0",
+        "numbagg>=0.8.0",
+        "connectorx>=0.3.0"
     ],
     author="Atul Sharma",
     description="A PySpark application for processing delimited files and loading them into a database",
@@ -1,22 +1,278 @@
 """
 Class for analyzing employee data.
 """
+import connectorx as cx
+import numbagg
+import numpy as np
 import pandas as pd
-from typing import Any
-from sqlalchemy import text, create_engine
+from pandas.api.types import is_integer_dtype
+from typing import Any, Callable, Dict, Optional
+from sqlalchemy import inspect, make_url, text
+from sqlalchemy.engine import Engine
+from .spark_processor import get_engine
 from .employee_queries import EmployeeQueries
+from .kernels import grouped_stats, salary_bucket_codes
+
+# Salary range boundaries; each bucket is closed on the left (e.g. 80000 is 'Medium')
+SALARY_BINS = [-np.inf, 80000, 100000, 120000, np.inf]
+SALARY_LABELS = ['Entry (Below 80k)', 'Medium (80k-100k)', 'High (100k-120k)', 'Very High (120k+)']
+SALARY_EDGES = np.array(SALARY_BINS[1:-1], dtype=np.int64)
+SALARY_INDEX = pd.CategoricalIndex(SALARY_LABELS, categories=SALARY_LABELS, name='salary_range')
+
+# Summary tables rebuilt by Analysis.refresh_mv (name -> aggregate over employees)
+METRIC_VIEWS = {
+    'dept_metrics_mv': """
+        SELECT 
+            department,
+            COUNT(*) as employee_count,
+            AVG(salary) as avg_salary,
+            MIN(salary) as min_salary,
+            MAX(salary) as max_salary,
+            SUM(salary) as total_payroll
+        FROM employees
+        GROUP BY department
+        """,
+    'level_metrics_mv': """
+        SELECT 
+            level,
+            COUNT(*) as employee_count,
+            AVG(salary) as avg_salary,
+            MIN(salary) as min_salary,
+            MAX(salary) as max_salary,
+            SUM(salary) as total_payroll
+        FROM employees
+        GROUP BY level
+        """,
+    'dept_level_mv': """
+        SELECT 
+            department,
+            level,
+            COUNT(*) as employee_count,
+            AVG(salary) as avg_salary
+        FROM employees
+        GROUP BY department, level
+        """,
+}
+SALARY_RANGE_MV = 'salary_range_mv'
+
+# Reports served by Analysis (report name -> summary table, ORDER BY clause)
+REPORTS = {
+    'department_metrics': ('dept_metrics_mv', 'total_payroll DESC'),
+    'level_metrics': ('level_metrics_mv', 'avg_salary DESC'),
+    'department_level_distribution': ('dept_level_mv', 'department, level'),
+    'salary_ranges': (SALARY_RANGE_MV, 'min_salary'),
+}
+
+# Rows fetched per round-trip when aggregating raw employee rows
+DEFAULT_CHUNKSIZE = 50000
+
+# Parallel range partitions used by connectorx reads from database servers
+CX_PARTITIONS = 4
+
+def _stream_agg(conn: Any, query: str, combine_fn: Callable[[Any, pd.DataFrame], Any],
+                init: Any, chunksize: int) -> Any:
+    """Fold a query result through an aggregator one chunk at a time.
+    
+    Args:
+        conn: SQLAlchemy engine or connection
+        query: SQL query to stream
+        combine_fn: Function merging a chunk into the running state
+        init: Initial state
+        chunksize: Number of rows per chunk
+        
+    Returns:
+        The final aggregation state
+    """
+    state = init
+    for chunk in pd.read_sql_query(text(query), conn, chunksize=chunksize):
+        state = combine_fn(state, chunk)
+    return state
+
+def _group_metrics(values: np.ndarray, codes: np.ndarray, labels: pd.Index,
+                   use_numbagg: bool = False) -> pd.DataFrame:
+    """Compute count/sum/min/max of values per group.
+    
+    Args:
+        values: 1-D array of values
+        codes: Group code of each value, indexing into ``labels``
+        labels: Group labels
+        use_numbagg: Use numbagg's multi-threaded group reductions instead of
+            the single-pass ``grouped_stats`` kernel (default: False)
+        
+    Returns:
+        DataFrame: Metrics indexed by label, for groups with at least one value
+    """
+    codes = codes.astype(np.int64)
+    if use_numbagg:
+        num_labels = len(labels)
+        count = numbagg.group_nancount(values, codes, num_labels=num_labels).astype(np.int64)
+        total = numbagg.group_nansum(values, codes, num_labels=num_labels)
+        # Empty groups produce NaN, which integer outputs flag as invalid;
+        # those groups are dropped below
+        with np.errstate(invalid='ignore'):
+            minimum = numbagg.group_nanmin(values, codes, num_labels=num_labels)
+            maximum = numbagg.group_nanmax(values, codes, num_labels=num_labels)
+    else:
+        count, total, minimum, maximum = grouped_stats(
+            values, codes, np.empty(len(labels), dtype=np.int64))
+    metrics = pd.DataFrame({'count': count, 'sum': total, 'min': minimum, 'max': maximum},
+                           index=labels)
+    return metrics[count > 0]
+
+def _merge_group_metrics(state: Optional[pd.DataFrame], partial: pd.DataFrame) -> pd.DataFrame:
+    """Merge per-group count/sum/min/max from one chunk into the running totals.
+    
+    Args:
+        state: Running totals indexed by group, or None before the first chunk
+        partial: Totals for the current chunk
+        
+    Returns:
+        DataFrame: Updated running totals
+    """
+    if state is None:
+        return partial
+    return (pd.concat([state, partial])
+            .groupby(level=0, observed=True)
+            .agg({'count': 'sum', 'sum': 'sum', 'min': 'min', 'max': 'max'}))
 
 class Analysis:
-    """Class for analyzing employee data."""
+    """Class for analyzing employee data.
+    
+    Metrics are read from summary tables built by ``refresh_mv``, which
+    ``DataProcessor.write_to_database`` calls after each load of the
+    employees table. Missing summary tables are built on first use; after
+    changing the employees table any other way, call ``refresh_mv``.
+    """
     
-    def __init__(self, db_url: str):
+    def __init__(self, db_url: str, chunksize: int = DEFAULT_CHUNKSIZE,
+                 use_numbagg: bool = False, engine: Optional[Engine] = None):
         """Initialize with database URL.
         
         Args:
             db_url: Database connection URL
+            chunksize: Rows per chunk when aggregating raw rows (default: 50000)
+            use_numbagg: Use numbagg group reductions for raw-row aggregation (default: False)
+            engine: Existing engine to share instead of the cached engine for db_url.
+                Only SQLite reads go through it; reads from database servers use
+                connectorx, which opens its own connections from db_url
         """
         self.db_url = db_url
-        self.engine = create_engine(db_url)
+        self.engine = engine if engine is not None else get_engine(db_url)
+        self.chunksize = chunksize
+        self.use_numbagg = use_numbagg
+    
+    def refresh_mv(self) -> None:
+        """Rebuild the summary tables from the employees table.
+        
+        On PostgreSQL the SQL aggregates are materialized views refreshed in
+        place; elsewhere they are plain tables recreated from scratch. All
+        tables are rebuilt in a single transaction.
+        """
+        with self.engine.begin() as conn:
+            for name, query in METRIC_VIEWS.items():
+                if 'postgresql' in self.db_url:
+                    conn.execute(text(f"CREATE MATERIALIZED VIEW IF NOT EXISTS {name} AS {query} WITH NO DATA"))
+                    conn.execute(text(f"REFRESH MATERIALIZED VIEW {name}"))
+                else:
+                    conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                    conn.execute(text(f"CREATE TABLE {name} AS {query}"))
+            
+            self._compute_salary_ranges(conn).to_sql(
+                SALARY_RANGE_MV, conn, if_exists='replace', index=False)
+    
+    def _read_mv(self, name: str, order_by: str) -> pd.DataFrame:
+        """Read a summary table, building the summary tables if it is missing.
+        
+        Args:
+            name: Summary table name
+            order_by: ORDER BY clause for the result
+            
+        Returns:
+            DataFrame: Summary table contents
+        """
+        if not inspect(self.engine).has_table(name):
+            self.refresh_mv()
+        return self._read_sql(f"SELECT * FROM {name} ORDER BY {order_by}")
+    
+    def _read_sql(self, query: str, partition_on: Optional[str] = None) -> pd.DataFrame:
+        """Run a query into a DataFrame.
+        
+        Database servers are read with connectorx, which fills columnar
+        buffers directly and splits the read into parallel range partitions
+        on ``partition_on`` when given. SQLite stays on ``pd.read_sql``, since
+        connectorx reads SQLite on a single thread.
+        
+        Args:
+            query: SQL query
+            partition_on: Numeric column to partition the read on
+            
+        Returns:
+            DataFrame: Query result
+        """
+        if 'sqlite' in self.db_url:
+            return pd.read_sql(query, self.engine)
+        
+        url = make_url(self.db_url)
+        cx_url = url.set(drivername=url.get_backend_name()).render_as_string(hide_password=False)
+        if partition_on:
+            return cx.read_sql(cx_url, query, partition_on=partition_on,
+                               partition_num=CX_PARTITIONS, return_type='pandas')
+        return cx.read_sql(cx_url, query, return_type='pandas')
+    
+    def _compute_salary_ranges(self, conn: Any) -> pd.DataFrame:
+        """Compute salary range metrics from the employees table.
+        
+        On SQLite, salaries are streamed in chunks of ``self.chunksize`` rows
+        so memory stays bounded regardless of table size. Database servers
+        are read in one partitioned connectorx pass instead. NULL salaries
+        are left out of every range, as SQL aggregates ignore them.
+        
+        Args:
+            conn: SQLAlchemy engine or connection
+            
+        Returns:
+            DataFrame: Salary range metrics
+        """
+        def combine(state: Optional[pd.DataFrame], chunk: pd.DataFrame) -> pd.DataFrame:
+            # Keep fractional salaries (REAL/NUMERIC columns) as floats
+            salary = chunk['salary']
+            salary = salary.to_numpy(np.int64 if is_integer_dtype(salary) else np.float64)
+            codes = salary_bucket_codes(salary, SALARY_EDGES)
+            partial = _group_metrics(salary, codes, SALARY_INDEX, self.use_numbagg)
+            return _merge_group_metrics(state, partial)
+        
+        query = "SELECT salary FROM employees WHERE salary IS NOT NULL"
+        if 'sqlite' in self.db_url:
+            totals = _stream_agg(conn, query, combine, None, self.chunksize)
+        else:
+            salaries = self._read_sql(query, partition_on='salary')
+            totals = combine(None, salaries) if len(salaries) else None
+        if totals is None:
+            totals = pd.DataFrame(columns=['count', 'sum', 'min', 'max'], index=SALARY_INDEX[:0])
+        
+        ranges = pd.DataFrame({
+            'employee_count': totals['count'],
+            'avg_salary': totals['sum'] / totals['count'],
+            'min_salary': totals['min'],
+            'max_salary': totals['max'],
+        }).reset_index()
+        ranges['salary_range'] = ranges['salary_range'].astype(str)
+        return ranges
+    
+    def all_metrics(self) -> Dict[str, pd.DataFrame]:
+        """Compute every report at once.
+        
+        The summary tables are checked with a single inspector and rebuilt at
+        most once before all of them are read.
+        
+        Returns:
+            dict: Report name (e.g. 'department_metrics') -> DataFrame
+        """
+        inspector = inspect(self.engine)
+        if not all(inspector.has_table(name) for name, _ in REPORTS.values()):
+            self.refresh_mv()
+        return {report: self._read_sql(f"SELECT * FROM {name} ORDER BY {order_by}")
+                for report, (name, order_by) in REPORTS.items()}
     
     def department_metrics(self) -> pd.DataFrame:
         """Analyze metrics by department.
@@ -24,19 +280,7 @@ class Analysis:
         Returns:
             DataFrame: Department metrics
         """
-        query = """
-        SELECT 
-            department,
-            COUNT(*) as employee_count,
-            AVG(salary) as avg_salary,
-            MIN(salary) as min_salary,
-            MAX(salary) as max_salary,
-            SUM(salary) as total_payroll
-        FROM employees
-        GROUP BY department
-        ORDER BY total_payroll DESC
-        """
-        return pd.read_sql(query, self.engine)
+        return self._read_mv(*REPORTS['department_metrics'])
     
     def level_metrics(self) -> pd.DataFrame:
         """Analyze metrics by level.
@@ -44,19 +288,7 @@ class Analysis:
         Returns:
             DataFrame: Level metrics
         """
-        query = """
-    SELECT 
-        level,
-        COUNT(*) as employee_count,
-        AVG(salary) as avg_salary,
-        MIN(salary) as min_salary,
-        MAX(salary) as max_salary,
-        SUM(salary) as total_payroll
-    FROM employees
-    GROUP BY level
-    ORDER BY avg_salary DESC
-    """
-        return pd.read_sql(query, self.engine)
+        return self._read_mv(*REPORTS['level_metrics'])
     
     def department_level_distribution(self) -> pd.DataFrame:
         """Analyze distribution across departments and levels.
@@ -64,17 +296,7 @@ class Analysis:
         Returns:
             DataFrame: Department-level distribution
         """
-        query = """
-        SELECT 
-            department,
-            level,
-            COUNT(*) as employee_count,
-            AVG(salary) as avg_salary
-        FROM employees
-        GROUP BY department, level
-        ORDER BY department, level
-        """
-        return pd.read_sql(query, self.engine)
+        return self._read_mv(*REPORTS['department_level_distribution'])
     
     def salary_ranges(self) -> pd.DataFrame:
         """Analyze salary ranges.
@@ -82,20 +304,4 @@ class Analysis:
         Returns:
             DataFrame: Salary range metrics
         """
-        query = """
-        SELECT 
-            CASE 
-                WHEN salary >= 120000 THEN 'Very High (120k+)'
-                WHEN salary >= 100000 THEN 'High (100k-120k)'
-                WHEN salary >= 80000 THEN 'Medium (80k-100k)'
-                ELSE 'Entry (Below 80k)'
-            END as salary_range,
-            COUNT(*) as employee_count,
-            AVG(salary) as avg_salary,
-            MIN(salary) as min_salary,
-            MAX(salary) as max_salary
-        FROM employees
-        GROUP BY salary_range
-        ORDER BY min_salary
-        """
-        return pd.read_sql(query, self.engine)
\ No newline at end of file
+        return self._read_mv(*REPORTS['salary_ranges'])
\ No newline at end of file
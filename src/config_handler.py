@@ -1,12 +1,37 @@
 """
 Configuration handler for the Spark processor.
 """
+import copy
 import yaml
 from typing import Dict, Any
 from pathlib import Path
 from dotenv import load_dotenv
+from functools import lru_cache
 import os
 
+try:
+    from yaml import CSafeLoader as SafeLoader  # libyaml C parser
+except ImportError:
+    from yaml import SafeLoader
+
+__all__ = ['Config']
+
+load_dotenv()  # Load environment variables from .env file, once per process
+
+@lru_cache(maxsize=4)
+def _load_cached(config_path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a YAML configuration file, memoized on its path and mtime.
+    
+    Args:
+        config_path (str): Path to the YAML configuration file
+        mtime_ns (int): File modification time, so edits invalidate the cache
+        
+    Returns:
+        dict: Configuration dictionary
+    """
+    with open(config_path, 'r') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
 class Config:
     """Configuration handler for the application."""
     
@@ -18,16 +43,17 @@ class Config:
         """
         self.config_path = config_path
         self.config = self._load_config()
-        load_dotenv()  # Load environment variables from .env file
 
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file.
         
+        The file is parsed once until it is modified; each instance gets its
+        own copy, so changes to one instance's configuration stay local.
+        
         Returns:
             dict: Configuration dictionary
         """
-        with open(self.config_path, 'r') as f:
-            return yaml.safe_load(f)
+        return copy.deepcopy(_load_cached(self.config_path, os.stat(self.config_path).st_mtime_ns))
 
     def _validate_source_config(self, config: Dict[str, Any]) -> None:
         """Validate source configuration.
@@ -71,6 +97,15 @@ class Config:
         """
         return self.config.get('target', {})
 
+    @property
+    def analysis_config(self) -> Dict[str, Any]:
+        """Get analysis configuration.
+        
+        Returns:
+            dict: Analysis configuration
+        """
+        return self.config.get('analysis', {})
+
     def get_db_url(self) -> str:
         """Construct database URL from configuration.
         
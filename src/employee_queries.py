@@ -2,17 +2,35 @@
 Query functionality for employee data.
 """
 import pandas as pd
-from sqlalchemy import create_engine, text
-from typing import Dict, Any, List, Optional
+from sqlalchemy import and_, bindparam, column, literal_column, select, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import Select
+from .spark_processor import get_engine
+from typing import Dict, Any, List, Optional, Tuple
+
+# City lists longer than this are joined against a temporary table instead of
+# being bound as one IN parameter each
+CITY_IN_LIMIT = 100
+
+# Statements that drop only the temporary city filter table, never a permanent
+# table of the same name (dialect name -> statement)
+DROP_CITY_FILTER = {
+    'postgresql': "DROP TABLE IF EXISTS pg_temp.city_filter",
+    'mysql': "DROP TEMPORARY TABLE IF EXISTS city_filter",
+    'sqlite': "DROP TABLE IF EXISTS temp.city_filter",
+}
 
 class EmployeeQueries:
-    def __init__(self, db_url: str):
+    def __init__(self, db_url: str, engine: Optional[Engine] = None):
         """Initialize query handler.
         
         Args:
             db_url (str): Database URL
+            engine (Engine, optional): Existing engine to share instead of the
+                cached engine for ``db_url``
         """
-        self.engine = create_engine(db_url)
+        self.engine = engine if engine is not None else get_engine(db_url)
+        self._stmt_cache: Dict[Tuple, Select] = {}
 
     def query_by_criteria(self, 
                          criteria: Dict[str, Any],
@@ -28,27 +46,50 @@ class EmployeeQueries:
         Returns:
             DataFrame: Matching employee records
         """
-        conditions = []
         params = {}
+        shape = []
+        for name, value in sorted(criteria.items()):
+            is_list = isinstance(value, (list, tuple))
+            params[name] = list(value) if is_list else value
+            shape.append((name, is_list))
         
-        for column, value in criteria.items():
-            if isinstance(value, (list, tuple)):
-                placeholders = [f":val_{column}_{i}" for i in range(len(value))]
-                conditions.append(f"{column} IN ({','.join(placeholders)})")
-                for i, val in enumerate(value):
-                    params[f"val_{column}_{i}"] = val
-            else:
-                conditions.append(f"{column} = :val_{column}")
-                params[f"val_{column}"] = value
+        key = (tuple(shape), sort_by, ascending)
+        stmt = self._stmt_cache.get(key)
+        if stmt is None:
+            stmt = self._build_criteria_query(shape, sort_by, ascending)
+            self._stmt_cache[key] = stmt
         
-        query = "SELECT * FROM employees"
-        if conditions:
-            query += " WHERE " + " AND ".join(conditions)
+        return pd.read_sql(stmt, self.engine, params=params)
+
+    def _build_criteria_query(self,
+                              shape: List[Tuple[str, bool]],
+                              sort_by: Optional[str],
+                              ascending: bool) -> Select:
+        """Build a parameterized query for a set of criteria columns.
+        
+        Values are bound at execution time, so the statement (and SQLAlchemy's
+        compiled form of it) is reused for every call with the same columns.
+        
+        Args:
+            shape (list): (column name, is list-valued) pairs
+            sort_by (str, optional): Column to sort by
+            ascending (bool): Sort order
             
-        if sort_by:
-            query += f" ORDER BY {sort_by} {'ASC' if ascending else 'DESC'}"
+        Returns:
+            Select: Query over the employees table
+        """
+        conditions = [
+            column(name).in_(bindparam(name, expanding=True)) if is_list
+            else column(name) == bindparam(name)
+            for name, is_list in shape
+        ]
         
-        return pd.read_sql(text(query), self.engine, params=params)
+        stmt = select(literal_column('*')).select_from(table('employees'))
+        if conditions:
+            stmt = stmt.where(and_(*conditions))
+        if sort_by:
+            stmt = stmt.order_by(column(sort_by).asc() if ascending else column(sort_by).desc())
+        return stmt
 
     def get_salary_stats_by_occupation(self) -> pd.DataFrame:
         """Get salary statistics grouped by occupation.
@@ -90,7 +131,24 @@ class EmployeeQueries:
         Returns:
             DataFrame: Matching employee records
         """
-        placeholders = [f":city_{i}" for i in range(len(cities))]
-        query = f"SELECT * FROM employees WHERE city IN ({','.join(placeholders)}) ORDER BY city, salary DESC"
-        params = {f"city_{i}": city for i, city in enumerate(cities)}
-        return pd.read_sql(text(query), self.engine, params=params)
\ No newline at end of file
+        if len(cities) <= CITY_IN_LIMIT:
+            query = text("SELECT * FROM employees WHERE city IN :cities ORDER BY city, salary DESC")
+            query = query.bindparams(bindparam("cities", expanding=True))
+            return pd.read_sql(query, self.engine, params={"cities": list(cities)})
+        
+        # Long lists: load the distinct cities into a temporary table and join on it
+        with self.engine.connect() as conn:
+            conn.execute(text("CREATE TEMPORARY TABLE city_filter (city VARCHAR(255))"))
+            try:
+                conn.execute(text("INSERT INTO city_filter (city) VALUES (:city)"),
+                             [{"city": city} for city in dict.fromkeys(cities)])
+                query = ("SELECT e.* FROM employees e JOIN city_filter f ON e.city = f.city "
+                         "ORDER BY e.city, e.salary DESC")
+                return pd.read_sql(text(query), conn)
+            finally:
+                # Roll back first: a failed statement leaves a PostgreSQL transaction
+                # aborted, and rolling back may already have removed the table there
+                conn.rollback()
+                conn.execute(text(DROP_CITY_FILTER.get(conn.dialect.name,
+                                                       "DROP TABLE IF EXISTS city_filter")))
+                conn.commit()
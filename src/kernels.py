@@ -0,0 +1,61 @@
+"""
+Numba kernels for analysis hot loops.
+"""
+import numpy as np
+from numba import guvectorize, njit, prange
+
+@njit(parallel=True, cache=True)
+def salary_bucket_codes(salary: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Assign each salary the index of its salary range.
+    
+    A salary's code is the number of ``edges`` it is greater than or equal
+    to, so ranges are closed on the left like ``pd.cut(..., right=False)``.
+    
+    Args:
+        salary: 1-D array of salaries
+        edges: Sorted inner range boundaries
+        
+    Returns:
+        ndarray: int8 range codes in ``[0, len(edges)]``
+    """
+    out = np.empty(salary.shape[0], np.int8)
+    for i in prange(salary.shape[0]):
+        code = 0
+        for j in range(edges.shape[0]):
+            code += salary[i] >= edges[j]
+        out[i] = code
+    return out
+
+@guvectorize(['void(int64[:], int64[:], int64[:], int64[:], int64[:], int64[:], int64[:])',
+              'void(float64[:], int64[:], int64[:], int64[:], float64[:], float64[:], float64[:])'],
+             '(n),(n),(g)->(g),(g),(g),(g)', cache=True)
+def grouped_stats(values, codes, _groups, count, total, minimum, maximum):
+    """Compute count, sum, min and max of ``values`` per group code.
+    
+    ``_groups`` only fixes the number of groups (its length); codes must lie
+    in ``[0, len(_groups))``. Min and max are undefined for empty groups.
+    
+    Args:
+        values: 1-D array of values
+        codes: Group code of each value
+        _groups: Array whose length is the number of groups
+        
+    Returns:
+        tuple: (count, total, minimum, maximum) arrays, one entry per group
+    """
+    for g in range(count.shape[0]):
+        count[g] = 0
+        total[g] = 0
+    for i in range(values.shape[0]):
+        g = codes[i]
+        value = values[i]
+        if count[g] == 0:
+            minimum[g] = value
+            maximum[g] = value
+        else:
+            if value < minimum[g]:
+                minimum[g] = value
+            if value > maximum[g]:
+                maximum[g] = value
+        count[g] += 1
+        total[g] += value
@@ -1,27 +1,48 @@
 """Performance monitoring utilities."""
 import time
 import logging
-import psutil
 import os
+import sys
 from functools import wraps
 from typing import Callable, Any
 
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+def _peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MB.
+    
+    Returns:
+        float: Peak RSS in MB
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in KB on Linux
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
 def measure_performance(func: Callable) -> Callable:
     """Decorator to measure execution time and memory usage of a function.
     
+    Measurement is only enabled when the ``PERF`` environment variable is
+    set to ``1`` at import time; otherwise ``func`` is returned unchanged so
+    there is no per-call overhead.
+    
     Args:
         func: The function to measure
         
     Returns:
         Wrapped function that logs performance metrics
     """
+    if os.environ.get('PERF') != '1' or resource is None:
+        return func
+    
     @wraps(func)
     def wrapper(*args, **kwargs) -> Any:
         logger = logging.getLogger(func.__module__)
-        process = psutil.Process(os.getpid())
         
         # Memory before
-        mem_before = process.memory_info().rss / 1024 / 1024  # MB
+        mem_before = _peak_rss_mb()
         
         # Time the execution
         start_time = time.time()
@@ -29,7 +50,7 @@ def measure_performance(func: Callable) -> Callable:
         end_time = time.time()
         
         # Memory after
-        mem_after = process.memory_info().rss / 1024 / 1024  # MB
+        mem_after = _peak_rss_mb()
         
         # Log metrics
         duration = end_time - start_time
@@ -5,9 +5,11 @@ import unittest
 import pandas as pd
 import tempfile
 import os
-from sqlalchemy import create_engine
+import warnings
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.pool import StaticPool
 from src.employee_queries import EmployeeQueries
-from src.analysis import Analysis
+from src.analysis import SALARY_BINS, SALARY_LABELS, Analysis
 
 class TestDataAnalysis(unittest.TestCase):
     @classmethod
@@ -30,24 +32,30 @@ class TestDataAnalysis(unittest.TestCase):
             'salary': [90000, 120000, 95000, 85000, 80000, 75000, 115000]
         })
         
+        # One connection shared by every test keeps SQLite's page cache warm
+        cls.engine = create_engine(cls.db_url, poolclass=StaticPool,
+                                   connect_args={'check_same_thread': False})
+        
         # Create database and populate with test data
-        engine = create_engine(cls.db_url)
-        cls.test_data.to_sql('employees', engine, if_exists='replace', index=False)
+        cls.test_data.to_sql('employees', cls.engine, if_exists='replace', index=False)
         
         # Initialize queries
-        cls.queries = EmployeeQueries(cls.db_url)
+        cls.queries = EmployeeQueries(cls.db_url, engine=cls.engine)
+        
+        # Compute every report in one pass
+        cls.metrics = Analysis(cls.db_url, engine=cls.engine).all_metrics()
 
     @classmethod
     def tearDownClass(cls):
         """Clean up test environment after all tests."""
+        cls.engine.dispose()
         if os.path.exists(cls.db_path):
             os.remove(cls.db_path)
         os.rmdir(cls.temp_dir)
 
     def test_analyze_department_metrics(self):
         """Test department metrics analysis."""
-        analyzer = Analysis(self.db_url)
-        metrics = analyzer.department_metrics()
+        metrics = self.metrics['department_metrics']
         
         # Check basic structure
         self.assertIn('department', metrics.columns)
@@ -62,8 +70,7 @@ class TestDataAnalysis(unittest.TestCase):
 
     def test_analyze_level_metrics(self):
         """Test level metrics analysis."""
-        analyzer = Analysis(self.db_url)
-        metrics = analyzer.level_metrics()
+        metrics = self.metrics['level_metrics']
         
         # Check basic structure
         self.assertIn('level', metrics.columns)
@@ -77,8 +84,7 @@ class TestDataAnalysis(unittest.TestCase):
 
     def test_analyze_department_level_distribution(self):
         """Test department-level distribution analysis."""
-        analyzer = Analysis(self.db_url)
-        distribution = analyzer.department_level_distribution()
+        distribution = self.metrics['department_level_distribution']
         
         # Check basic structure
         self.assertIn('department', distribution.columns)
@@ -95,8 +101,7 @@ class TestDataAnalysis(unittest.TestCase):
 
     def test_analyze_salary_ranges(self):
         """Test salary range analysis."""
-        analyzer = Analysis(self.db_url)
-        ranges = analyzer.salary_ranges()
+        ranges = self.metrics['salary_ranges']
         
         # Check basic structure
         self.assertIn('salary_range', ranges.columns)
@@ -111,5 +116,79 @@ class TestDataAnalysis(unittest.TestCase):
         total_employees = ranges['employee_count'].sum()
         self.assertEqual(total_employees, len(self.test_data))
 
+    def test_all_metrics_matches_test_data(self):
+        """Test every report from all_metrics against aggregates of the raw test data."""
+        self.assertEqual(set(self.metrics), {'department_metrics', 'level_metrics',
+                                             'department_level_distribution', 'salary_ranges'})
+        salary = self.test_data['salary']
+        
+        for report, key in (('department_metrics', 'department'), ('level_metrics', 'level')):
+            expected = salary.groupby(self.test_data[key]).agg(['count', 'mean', 'min', 'max', 'sum'])
+            actual = self.metrics[report].set_index(key).loc[expected.index]
+            self.assertEqual(list(actual['employee_count']), list(expected['count']))
+            self.assertEqual(list(actual['avg_salary']), list(expected['mean']))
+            self.assertEqual(list(actual['min_salary']), list(expected['min']))
+            self.assertEqual(list(actual['max_salary']), list(expected['max']))
+            self.assertEqual(list(actual['total_payroll']), list(expected['sum']))
+        self.assertTrue(self.metrics['department_metrics']['total_payroll'].is_monotonic_decreasing)
+        
+        expected = self.test_data.groupby(['department', 'level']).size()
+        distribution = self.metrics['department_level_distribution']
+        self.assertEqual(list(distribution['employee_count']), list(expected))
+        self.assertEqual(list(zip(distribution['department'], distribution['level'])),
+                         list(expected.index))
+        
+        buckets = pd.cut(salary, bins=SALARY_BINS, labels=SALARY_LABELS, right=False)
+        expected = salary.groupby(buckets, observed=True).agg(['count', 'min', 'max'])
+        ranges = self.metrics['salary_ranges']
+        self.assertEqual(list(ranges['salary_range']), list(expected.index))
+        self.assertEqual(list(ranges['employee_count']), list(expected['count']))
+        self.assertEqual(list(ranges['min_salary']), list(expected['min']))
+        self.assertEqual(list(ranges['max_salary']), list(expected['max']))
+
+    def test_refresh_mv(self):
+        """Test rebuilding the summary tables."""
+        analyzer = Analysis(self.db_url, engine=self.engine)
+        analyzer.refresh_mv()
+        
+        tables = set(inspect(analyzer.engine).get_table_names())
+        self.assertTrue({'dept_metrics_mv', 'level_metrics_mv', 'dept_level_mv',
+                         'salary_range_mv'} <= tables)
+        
+        metrics = analyzer.department_metrics()
+        self.assertEqual(metrics['employee_count'].sum(), len(self.test_data))
+        self.assertEqual(metrics.iloc[0]['department'], 'Engineering')
+
+    def test_salary_ranges_with_numbagg(self):
+        """Test salary range analysis using numbagg group reductions."""
+        # Small chunks leave some salary ranges empty in each chunk
+        analyzer = Analysis(self.db_url, chunksize=2, use_numbagg=True, engine=self.engine)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', RuntimeWarning)
+            analyzer.refresh_mv()
+        ranges = analyzer.salary_ranges()
+        
+        self.assertEqual(list(ranges['salary_range']),
+                         ['Entry (Below 80k)', 'Medium (80k-100k)', 'High (100k-120k)', 'Very High (120k+)'])
+        self.assertEqual(list(ranges['employee_count']), [1, 4, 1, 1])
+        self.assertEqual(list(ranges['min_salary']), [75000, 80000, 115000, 120000])
+        self.assertEqual(list(ranges['max_salary']), [75000, 95000, 115000, 120000])
+
+    def test_salary_ranges_ignore_null_salaries(self):
+        """Test that NULL salaries are left out of the salary ranges."""
+        engine = create_engine('sqlite://', poolclass=StaticPool,
+                               connect_args={'check_same_thread': False})
+        data = self.test_data.astype({'salary': 'float64'})
+        data.loc[len(data)] = [8, 'Test User 8', 28, 'Boston', 'Analyst', 'Finance', 'Junior', None]
+        data.to_sql('employees', engine, index=False)
+        
+        for use_numbagg in (False, True):
+            analyzer = Analysis('sqlite://', use_numbagg=use_numbagg, engine=engine)
+            analyzer.refresh_mv()
+            ranges = analyzer.salary_ranges()
+            self.assertEqual(list(ranges['employee_count']), [1, 4, 1, 1])
+            self.assertEqual(ranges.iloc[0]['avg_salary'], 75000)
+        engine.dispose()
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -51,6 +51,29 @@ target:
         self.assertEqual(config.target_config['database'], "data/test.db")
         self.assertEqual(config.target_config['table'], "employees")
 
+    def test_analysis_config(self):
+        """Test reading the optional analysis section."""
+        config = Config(self.config_path)
+        self.assertEqual(config.analysis_config, {})
+        
+        config_path = os.path.join(self.temp_dir, 'analysis_config.yaml')
+        with open(config_path, 'w') as f:
+            f.write(self.config_content + "\nanalysis:\n  chunksize: 1000\n")
+        config = Config(config_path)
+        self.assertEqual(config.analysis_config['chunksize'], 1000)
+
+    def test_config_reloads_after_change(self):
+        """Test that cached configuration is per instance and re-read when the file changes."""
+        config = Config(self.config_path)
+        config.config['target']['database'] = 'data/mutated.db'
+        self.assertEqual(Config(self.config_path).target_config['database'], 'data/test.db')
+        
+        with open(self.config_path, 'w') as f:
+            f.write(self.config_content.replace('data/test.db', 'data/changed.db'))
+        stat = os.stat(self.config_path)
+        os.utime(self.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(Config(self.config_path).target_config['database'], 'data/changed.db')
+
     def test_get_db_url_sqlite(self):
         """Test getting database URL for SQLite."""
         config = Config(self.config_path)
@@ -1,20 +1,26 @@
 """
 Unit tests for the DataProcessor class.
 """
+import datetime
 import unittest
 import pandas as pd
+import pyarrow as pa
 import tempfile
 import os
-from sqlalchemy import create_engine
-from src.spark_processor import DataProcessor
+import shutil
+from types import SimpleNamespace
+from sqlalchemy import MetaData, Table, create_engine, inspect
+from sqlalchemy.dialects import postgresql
+from src.analysis import Analysis
+from src.spark_processor import DataProcessor, _pg_copy, _split_partitions, get_engine
 
 class TestDataProcessor(unittest.TestCase):
-    def setUp(self):
-        """Set up test environment before each test."""
-        self.processor = DataProcessor()
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared processor, sample data and temp directory once."""
+        cls.processor = DataProcessor()
         
-        # Create a temporary CSV file
-        self.test_data = pd.DataFrame({
+        cls.test_data = pd.DataFrame({
             'id': [1, 2],
             'name': ['Test User 1', 'Test User 2'],
             'age': [30, 35],
@@ -25,22 +31,25 @@ class TestDataProcessor(unittest.TestCase):
             'salary': [90000, 85000]
         })
         
-        self.temp_dir = tempfile.mkdtemp()
-        self.csv_path = os.path.join(self.temp_dir, 'test.csv')
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.csv_path = os.path.join(cls.temp_dir, 'test.csv')
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up the temp directory after all tests."""
+        cls.processor.stop()
+        shutil.rmtree(cls.temp_dir)
+
+    def setUp(self):
+        """Set up test environment before each test."""
+        # Tests may rewrite the CSV file, so restore it every time
         self.test_data.to_csv(self.csv_path, index=False)
         
-        # Set up SQLite database
-        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        # Each test gets its own database; engines are cached per URL, so a
+        # reused path could see a deleted file through a pooled connection
+        self.db_path = os.path.join(self.temp_dir, f'{self._testMethodName}.db')
         self.db_url = f"sqlite:///{self.db_path}"
 
-    def tearDown(self):
-        """Clean up test environment after each test."""
-        # Remove temporary files
-        os.remove(self.csv_path)
-        if os.path.exists(self.db_path):
-            os.remove(self.db_path)
-        os.rmdir(self.temp_dir)
-
     def test_read_delimited_file(self):
         """Test reading a delimited file."""
         # Test with default parameters
@@ -58,6 +67,81 @@ class TestDataProcessor(unittest.TestCase):
         df = self.processor.read_delimited_file(self.csv_path, delimiter='|')
         self.assertEqual(len(df), 2)
 
+    def test_read_delimited_file_pandas_backend(self):
+        """Test that the pandas and arrow CSV backends agree."""
+        with open(self.csv_path, 'a') as f:
+            f.write('3,,40,,Test Job 3,Dept 3,Junior,\n')
+            f.write('4,Test User 4,,Test City 4,2024-01-02,Dept 4,Junior,70000.5\n')
+        
+        for header in (True, False):
+            arrow_df = self.processor.read_delimited_file(self.csv_path, header=header)
+            pandas_df = self.processor.read_delimited_file(self.csv_path, header=header,
+                                                           backend='pandas')
+            pd.testing.assert_frame_equal(arrow_df, pandas_df)
+        
+        # Dates stay text, as with pd.read_csv
+        with open(self.csv_path, 'w') as f:
+            f.write('id,hired\n1,2024-01-02\n2,\n')
+        arrow_df = self.processor.read_delimited_file(self.csv_path)
+        pd.testing.assert_frame_equal(
+            arrow_df, self.processor.read_delimited_file(self.csv_path, backend='pandas'))
+        self.assertEqual(arrow_df.iloc[0]['hired'], '2024-01-02')
+        
+        with self.assertRaises(ValueError):
+            self.processor.read_delimited_file(self.csv_path, backend='invalid')
+
+    def test_read_delimited_file_with_schema(self):
+        """Test reading a headerless file with an explicit schema."""
+        schema = pa.schema([
+            ('id', pa.int64()), ('name', pa.string()), ('age', pa.int64()),
+            ('city', pa.string()), ('occupation', pa.string()),
+            ('department', pa.string()), ('level', pa.string()), ('salary', pa.int64())
+        ])
+        self.test_data.to_csv(self.csv_path, index=False, header=False)
+        
+        for backend in ('arrow', 'pandas'):
+            df = self.processor.read_delimited_file(self.csv_path, schema=schema, backend=backend)
+            self.assertEqual(len(df), len(self.test_data))
+            self.assertEqual(list(df.columns), schema.names)
+            self.assertEqual(df.iloc[0]['salary'], 90000)
+
+    def test_read_selected_columns(self):
+        """Test that only the requested columns are loaded, in the requested order."""
+        columns = ['salary', 'name', 'occupation']
+        for backend in ('arrow', 'pandas'):
+            df = self.processor.read_delimited_file(self.csv_path, backend=backend, columns=columns)
+            self.assertEqual(list(df.columns), columns)
+            self.assertEqual(df.iloc[0]['salary'], 90000)
+
+    def test_read_malformed_rows(self):
+        """Test dropping or failing on rows with the wrong number of fields."""
+        with open(self.csv_path, 'a') as f:
+            f.write('3,Broken,40,Extra,Fields,Here,And,More,Again\n')
+            f.write('4,Short,41\n')
+        
+        for backend in ('arrow', 'pandas'):
+            with self.assertLogs('src.spark_processor', level='WARNING') as logs:
+                df = self.processor.read_delimited_file(self.csv_path, backend=backend)
+            self.assertEqual(list(df['id']), [1, 2])
+            self.assertIn('Dropped 2 malformed rows', logs.output[0])
+            with self.assertRaises(Exception):
+                self.processor.read_delimited_file(self.csv_path, backend=backend, mode='FAILFAST')
+        
+        with self.assertRaises(ValueError):
+            self.processor.read_delimited_file(self.csv_path, mode='PERMISSIVE')
+
+    def test_read_parquet_file(self):
+        """Test reading a Parquet file."""
+        parquet_path = os.path.join(self.temp_dir, 'test.parquet')
+        self.test_data.to_parquet(parquet_path, index=False)
+        try:
+            df = self.processor.read_delimited_file(parquet_path)
+            self.assertEqual(len(df), 2)
+            self.assertEqual(list(df.columns), list(self.test_data.columns))
+            self.assertEqual(df.iloc[0]['salary'], 90000)
+        finally:
+            os.remove(parquet_path)
+
     def test_read_file_not_found(self):
         """Test reading a non-existent file."""
         with self.assertRaises(Exception):
@@ -92,6 +176,116 @@ class TestDataProcessor(unittest.TestCase):
         self.assertEqual(len(result), 1)
         self.assertEqual(result.iloc[0]['name'], 'Test User 3')
 
+    def test_write_to_database_in_chunks(self):
+        """Test writing data across several insert chunks."""
+        self.processor.write_to_database(self.test_data, 'test_table', self.db_url,
+                                         mode='append', chunksize=1)
+        
+        engine = create_engine(self.db_url)
+        result = pd.read_sql('SELECT * FROM test_table ORDER BY id', engine)
+        self.assertEqual(len(result), 2)
+        self.assertEqual(list(result['name']), ['Test User 1', 'Test User 2'])
+
+    def test_pg_copy_quotes_identifiers(self):
+        """Test that COPY quotes table and column names like CREATE TABLE does."""
+        statements = []
+        
+        class Cursor:
+            def __enter__(self):
+                return self
+            def __exit__(self, *args):
+                pass
+            def copy_expert(self, sql, buffer):
+                statements.append((sql, buffer.read()))
+        
+        conn = SimpleNamespace(dialect=postgresql.dialect(),
+                               connection=SimpleNamespace(cursor=Cursor))
+        table = SimpleNamespace(table=Table('Employees', MetaData(), schema='hr'))
+        _pg_copy(table, conn, ['id', 'Name', 'order'], [(1, 'Ann', 2)])
+        
+        self.assertEqual(statements, [
+            ('COPY hr."Employees" (id, "Name", "order") FROM STDIN WITH CSV', '1,Ann,2\r\n')])
+
+    def test_split_partitions(self):
+        """Test splitting rows into contiguous slices for parallel writers."""
+        df = pd.DataFrame({'salary': [5, 1, 4, 2, 3]})
+        parts = _split_partitions(df, 2, 'salary')
+        self.assertEqual([list(p['salary']) for p in parts], [[1, 2, 3], [4, 5]])
+        self.assertEqual(len(_split_partitions(df, 8)), 5)
+        self.assertEqual(_split_partitions(df.iloc[:0], 4), [])
+
+    def test_write_partitions_concurrently(self):
+        """Test loading slices over several writer connections."""
+        # write_to_database clamps SQLite to one writer, so drive the writers directly
+        df = pd.concat([self.test_data] * 50, ignore_index=True).assign(id=range(100))
+        engine = get_engine(self.db_url)
+        df.iloc[:0].to_sql('test_table', engine, index=False)
+        self.processor._write_partitions(engine, df, 'test_table', 4, 'salary', 10, None)
+        
+        result = pd.read_sql('SELECT id FROM test_table ORDER BY id', engine)
+        self.assertEqual(result['id'].tolist(), list(range(100)))
+
+    def test_write_creates_schema_and_indexes(self):
+        """Test that the target table is created with typed columns and indexes."""
+        self.processor.write_to_database(self.test_data, 'test_table', self.db_url)
+        
+        inspector = inspect(create_engine(self.db_url))
+        column_types = {col['name']: str(col['type']) for col in inspector.get_columns('test_table')}
+        self.assertEqual(column_types['salary'], 'BIGINT')
+        self.assertEqual(column_types['name'], 'TEXT')
+        
+        index_names = {idx['name'] for idx in inspector.get_indexes('test_table')}
+        self.assertTrue({'idx_test_table_department', 'idx_test_table_level',
+                         'idx_test_table_salary', 'idx_test_table_dept_level'} <= index_names)
+
+    def test_write_matches_pandas_column_types(self):
+        """Test that pre-created columns get the types pandas' to_sql would pick."""
+        df = pd.DataFrame({
+            'object_int': pd.Series([5, 6], dtype=object),
+            'unsigned': pd.Series([1, 2], dtype='uint32'),
+            'day': [datetime.date(2024, 1, 1), datetime.date(2024, 1, 2)],
+            'stamp': pd.to_datetime(['2024-01-01', '2024-01-02']).tz_localize('UTC'),
+        })
+        self.processor.write_to_database(df, 'test_table', self.db_url)
+        
+        engine = create_engine(self.db_url)
+        df.to_sql('baseline_table', engine, index=False)
+        inspector = inspect(engine)
+        types = lambda name: [str(col['type']) for col in inspector.get_columns(name)]
+        self.assertEqual(types('test_table'), types('baseline_table'))
+        self.assertEqual(pd.read_sql('SELECT object_int FROM test_table', engine)['object_int'].tolist(),
+                         [5, 6])
+
+    def test_group_by_uses_composite_index(self):
+        """Test that department/level grouping is planned on the composite index."""
+        self.processor.write_to_database(self.test_data, 'test_table', self.db_url)
+        
+        engine = create_engine(self.db_url)
+        with engine.connect() as conn:
+            plan = conn.exec_driver_sql(
+                "EXPLAIN QUERY PLAN SELECT department, level, COUNT(*) FROM test_table "
+                "GROUP BY department, level").fetchall()
+        self.assertIn('idx_test_table_dept_level', ' '.join(row[-1] for row in plan))
+
+    def test_write_employees_refreshes_summary_tables(self):
+        """Test that every load of the employees table keeps the reports current."""
+        self.processor.write_to_database(self.test_data.iloc[:1], 'employees', self.db_url,
+                                         mode='overwrite')
+        self.assertEqual(len(Analysis(self.db_url).department_metrics()), 1)
+        
+        self.processor.write_to_database(self.test_data.iloc[1:], 'employees', self.db_url)
+        metrics = Analysis(self.db_url).all_metrics()['department_metrics']
+        self.assertEqual(sorted(metrics['department']), ['Dept 1', 'Dept 2'])
+
+    def test_write_employees_without_analysis_columns(self):
+        """Test that loading an employees table does not depend on the analysis schema."""
+        df = self.test_data[['id', 'name']]
+        self.processor.write_to_database(df, 'employees', self.db_url)
+        
+        engine = create_engine(self.db_url)
+        self.assertEqual(inspect(engine).get_table_names(), ['employees'])
+        self.assertEqual(len(pd.read_sql('SELECT * FROM employees', engine)), 2)
+
     def test_write_invalid_mode(self):
         """Test writing with invalid mode."""
         with self.assertRaises(Exception):
@@ -104,5 +298,20 @@ class TestDataProcessor(unittest.TestCase):
             self.processor.write_to_database(
                 self.test_data, 'test_table', 'invalid://url', mode='append')
 
+    def test_stop_releases_connections(self):
+        """Test that stop closes the pooled connections used for writing."""
+        self.processor.write_to_database(self.test_data, 'test_table', self.db_url)
+        self.assertGreater(get_engine(self.db_url).pool.checkedin(), 0)
+        
+        self.processor.stop()
+        self.assertEqual(get_engine(self.db_url).pool.checkedin(), 0)
+        self.processor.stop()
+
+    def test_get_engine_cached(self):
+        """Test that engines are reused for the same database URL."""
+        self.assertIs(get_engine(self.db_url), get_engine(self.db_url))
+        other_url = f"sqlite:///{os.path.join(self.temp_dir, 'other.db')}"
+        self.assertIsNot(get_engine(self.db_url), get_engine(other_url))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
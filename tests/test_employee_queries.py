@@ -5,7 +5,8 @@ import unittest
 import pandas as pd
 import tempfile
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.pool import StaticPool
 from src.employee_queries import EmployeeQueries
 
 class TestEmployeeQueries(unittest.TestCase):
@@ -29,16 +30,20 @@ class TestEmployeeQueries(unittest.TestCase):
             'salary': [90000, 120000, 95000, 85000, 80000]
         })
         
+        # One connection shared by every test keeps SQLite's page cache warm
+        cls.engine = create_engine(cls.db_url, poolclass=StaticPool,
+                                   connect_args={'check_same_thread': False})
+        
         # Create database and populate with test data
-        engine = create_engine(cls.db_url)
-        cls.test_data.to_sql('employees', engine, if_exists='replace', index=False)
+        cls.test_data.to_sql('employees', cls.engine, if_exists='replace', index=False)
         
         # Initialize queries
-        cls.queries = EmployeeQueries(cls.db_url)
+        cls.queries = EmployeeQueries(cls.db_url, engine=cls.engine)
 
     @classmethod
     def tearDownClass(cls):
         """Clean up test environment after all tests."""
+        cls.engine.dispose()
         if os.path.exists(cls.db_path):
             os.remove(cls.db_path)
         os.rmdir(cls.temp_dir)
@@ -67,6 +72,20 @@ class TestEmployeeQueries(unittest.TestCase):
         })
         self.assertEqual(len(result), 3)
 
+    def test_query_by_criteria_reuses_statement(self):
+        """Test that calls with the same criteria columns share one statement."""
+        queries = EmployeeQueries(self.db_url, engine=self.engine)
+        result = queries.query_by_criteria({'city': ['Seattle'], 'level': 'Mid-Level'})
+        self.assertEqual(len(result), 1)
+        result = queries.query_by_criteria({'level': 'Senior', 'city': ['New York', 'Boston']})
+        self.assertEqual(len(result), 3)
+        self.assertEqual(len(queries._stmt_cache), 1)
+
+    def test_shared_engine(self):
+        """Test that an injected engine is used instead of the cached one."""
+        self.assertIs(self.queries.engine, self.engine)
+        self.assertIsNot(EmployeeQueries(self.db_url).engine, self.engine)
+
     def test_get_salary_stats_by_occupation(self):
         """Test salary statistics by occupation."""
         result = self.queries.get_salary_stats_by_occupation()
@@ -94,6 +113,24 @@ class TestEmployeeQueries(unittest.TestCase):
         # Test with non-existent city
         result = self.queries.get_employees_by_city(['NonExistentCity'])
         self.assertEqual(len(result), 0)
+        
+        # Test a long list, which is joined against a temporary table
+        cities = ['New York', 'Boston'] + [f'City {i}' for i in range(200)] + ['Boston']
+        long_result = self.queries.get_employees_by_city(cities)
+        pd.testing.assert_frame_equal(
+            long_result, self.queries.get_employees_by_city(['New York', 'Boston']))
+        self.assertEqual(len(self.queries.get_employees_by_city(cities)), 3)
+        
+        # A permanent table with the same name is left alone
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql("CREATE TABLE city_filter (city TEXT)")
+        try:
+            self.queries.get_employees_by_city(cities)
+            with self.engine.connect() as conn:
+                self.assertTrue(inspect(conn).has_table('city_filter'))
+        finally:
+            with self.engine.begin() as conn:
+                conn.exec_driver_sql("DROP TABLE city_filter")
 
     def test_invalid_queries(self):
         """Test handling of invalid queries."""
@@ -0,0 +1,51 @@
+"""
+Unit tests for the Numba analysis kernels.
+"""
+import unittest
+import numpy as np
+import pandas as pd
+from src.analysis import SALARY_BINS, SALARY_EDGES
+from src.kernels import grouped_stats, salary_bucket_codes
+
+class TestKernels(unittest.TestCase):
+    def setUp(self):
+        """Set up sample salaries, including values on every boundary."""
+        self.salaries = np.array([50000, 79999, 80000, 99999, 100000,
+                                  119999, 120000, 150000], dtype=np.int64)
+
+    def test_salary_bucket_codes(self):
+        """Test bucket codes on and around the range boundaries."""
+        codes = salary_bucket_codes(self.salaries, SALARY_EDGES)
+        self.assertEqual(codes.dtype, np.int8)
+        self.assertEqual(list(codes), [0, 0, 1, 1, 2, 2, 3, 3])
+
+    def test_salary_bucket_codes_match_pd_cut(self):
+        """Test that bucket codes agree with left-closed pd.cut."""
+        salaries = np.random.default_rng(0).integers(20000, 200000, 10000)
+        expected = pd.cut(salaries, bins=SALARY_BINS, right=False).codes
+        np.testing.assert_array_equal(salary_bucket_codes(salaries, SALARY_EDGES), expected)
+
+    def test_grouped_stats(self):
+        """Test per-group count, sum, min and max against pandas groupby."""
+        departments = pd.Series(['Sales', 'HR', 'Sales', 'Legal', 'HR', 'Sales'])
+        salaries = np.array([100, 50, 300, 70, 80, 200], dtype=np.int64)
+        codes, uniques = pd.factorize(departments)
+        
+        count, total, minimum, maximum = grouped_stats(
+            salaries, codes.astype(np.int64), np.empty(len(uniques), dtype=np.int64))
+        expected = (pd.Series(salaries).groupby(departments).agg(['count', 'sum', 'min', 'max'])
+                    .reindex(uniques))
+        self.assertEqual(list(count), list(expected['count']))
+        self.assertEqual(list(total), list(expected['sum']))
+        self.assertEqual(list(minimum), list(expected['min']))
+        self.assertEqual(list(maximum), list(expected['max']))
+
+    def test_grouped_stats_empty_group(self):
+        """Test that groups without values report a zero count."""
+        count, total, _, _ = grouped_stats(np.array([5.0, 7.0]), np.array([0, 0]),
+                                           np.empty(3, dtype=np.int64))
+        self.assertEqual(list(count), [2, 0, 0])
+        self.assertEqual(total[0], 12.0)
+
+if __name__ == '__main__':
+    unittest.main()